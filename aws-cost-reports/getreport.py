@@ -1,9 +1,18 @@
 #!/usr/bin/env python3
-import subprocess
+import argparse
 import json
 import csv
+import gzip
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from urllib.parse import unquote
 import calendar
+import boto3
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from openpyxl import Workbook
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 
@@ -36,46 +45,300 @@ def clean_tag_key(raw_key):
     # If key doesn't match expected format or is None
     return raw_key if raw_key else 'untagged'
 
-def get_cost_by_tag():
-    """Get cost data by cost-usage tag"""
-    start_date, end_date = get_previous_month_dates()
+# Cost Explorer requests issued in parallel (actuals, month-to-date, forecasts)
+CE_MAX_WORKERS = 8
+# Trailing days of the tags x dates matrix used for the run-rate projection;
+# the 1st of each month is left out (monthly TAX fee spike in 'untagged')
+RUN_RATE_DAYS = 7
+
+_ce_client = None
+_ce_cache = {}
+_ce_lock = threading.Lock()
+
+def get_ce_client():
+    """Single Cost Explorer client (one session, shared connection pool) for all requests"""
+    global _ce_client
+    with _ce_lock:
+        if _ce_client is None:
+            session = boto3.session.Session()
+            _ce_client = session.client('ce', config=Config(max_pool_connections=CE_MAX_WORKERS))
+        return _ce_client
+
+def ce_request(operation, **params):
+    """Call a Cost Explorer operation, following NextPageToken; responses are cached per request"""
+    cache_key = (operation, json.dumps(params, sort_keys=True))
+    with _ce_lock:
+        if cache_key in _ce_cache:
+            return _ce_cache[cache_key]
+
+    method = getattr(get_ce_client(), operation)
+    response = method(**params)
+    token = response.get('NextPageToken')
+    while token:
+        page = method(NextPageToken=token, **params)
+        for field in ('ResultsByTime', 'Tags'):
+            if field in page:
+                response.setdefault(field, []).extend(page[field])
+        token = page.get('NextPageToken')
+    response.pop('NextPageToken', None)
+    response.pop('ResponseMetadata', None)
+
+    with _ce_lock:
+        _ce_cache[cache_key] = response
+    return response
+
+# qstp buckets whose storage is split by test type (see lambda/qstp-s3-notification)
+QSTP_TAG = 'qstp'
+QSTP_BUCKETS = ('qstp-results', 'qstp-consul')
+# Result/<test-type>/<date>/... (uploaded results) and Report/<test-type>/<date>/... (generated Allure reports)
+RESULT_KEY_PATTERN = re.compile(r'^(Result|Report)/([^/]+)/(?:(\d{4}-\d{2}-\d{2})/)?')
+INVENTORY_BATCH_ROWS = 65536
+
+INVENTORY_COLUMNS = ('Bucket', 'Key', 'Size')
+
+def parse_inventory_schema(schema):
+    """Split an S3 Inventory fileSchema string ('Bucket, Key, Size, ...') into column names"""
+    return [column.strip() for column in schema.split(',') if column.strip()]
+
+def check_inventory_columns(columns, path):
+    """Stop with a clear message if the inventory lacks the columns the attribution needs"""
+    lookup = {column.lower() for column in columns}
+    missing = [column for column in INVENTORY_COLUMNS if column.lower() not in lookup]
+    if missing:
+        raise SystemExit(f"Error: S3 Inventory {path} has no {', '.join(missing)} field "
+                         f"(columns: {', '.join(columns) or 'none'}). "
+                         f"Enable the Size field in the inventory configuration.")
+
+def resolve_inventory_files(path, schema=None):
+    """Return (format, schema, data files) for an S3 Inventory manifest or data file"""
+    if path.endswith('manifest.json'):
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        base_dir = os.path.dirname(path)
+        files = []
+        for entry in manifest.get('files', []):
+            key = entry['key']
+            # Data files are listed with their S3 key; look for them next to the manifest
+            candidates = [os.path.join(base_dir, key),
+                          os.path.join(base_dir, 'data', os.path.basename(key)),
+                          os.path.join(base_dir, os.path.basename(key))]
+            found = next((c for c in candidates if os.path.exists(c)), None)
+            if found:
+                files.append(found)
+            else:
+                print(f"Warning: inventory data file not found locally: {key}")
+        return manifest.get('fileFormat', 'CSV').upper(), parse_inventory_schema(manifest.get('fileSchema', '')), files
+
+    if path.endswith('.parquet'):
+        return 'PARQUET', None, [path]
+
+    # CSV data files have no header; the column order depends on the inventory configuration
+    if not schema:
+        raise SystemExit(f"Error: cannot tell the column order of {path}. Pass the inventory manifest.json "
+                         f"instead, or give --inventory-schema (the manifest's fileSchema, "
+                         f"e.g. 'Bucket, Key, VersionId, IsLatest, IsDeleteMarker, Size').")
+    return 'CSV', schema, [path]
+
+def iter_inventory_rows(path, schema=None):
+    """Stream (bucket, key, size) rows from S3 Inventory CSV or Parquet files"""
+    file_format, schema, files = resolve_inventory_files(path, schema)
+
+    if file_format == 'CSV':
+        check_inventory_columns(schema, path)
+        lowered = [column.lower() for column in schema]
+        bucket_idx, key_idx, size_idx = (lowered.index('bucket'), lowered.index('key'), lowered.index('size'))
+        for data_file in files:
+            opener = gzip.open if data_file.endswith('.gz') else open
+            with opener(data_file, 'rt', encoding='utf-8', newline='') as f:
+                for row in csv.reader(f):
+                    size = row[size_idx] if size_idx < len(row) else ''
+                    # Keys are URL-encoded in CSV inventories
+                    yield row[bucket_idx], unquote(row[key_idx]), int(size) if size else 0
+
+    elif file_format == 'PARQUET':
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise SystemExit(f"Error: pyarrow is required to read Parquet inventory {path} "
+                             f"(pip install pyarrow), or use a CSV inventory")
+        for data_file in files:
+            parquet_file = pq.ParquetFile(data_file)
+            check_inventory_columns(parquet_file.schema_arrow.names, data_file)
+            for batch in parquet_file.iter_batches(batch_size=INVENTORY_BATCH_ROWS,
+                                                   columns=['bucket', 'key', 'size']):
+                columns = batch.to_pydict()
+                for bucket, key, size in zip(columns['bucket'], columns['key'], columns['size']):
+                    yield bucket, key, size or 0
 
-    print(f"Retrieving data for tag 'cost-usage' for period: {start_date} - {end_date}")
+    else:
+        print(f"Note: unsupported inventory format {file_format} in {path}")
+
+def get_qstp_storage(inventory_paths, schema=None):
+    """Aggregate qstp bucket storage by test type (Result/ and Report/<test-type>/) from S3 Inventory files in one pass"""
+    storage = {}
+
+    for path in inventory_paths:
+        print(f"Reading S3 Inventory: {path}")
+        rows = 0
+        for bucket, key, size in iter_inventory_rows(path, schema):
+            rows += 1
+            if bucket not in QSTP_BUCKETS:
+                continue
+
+            match = RESULT_KEY_PATTERN.match(key)
+            test_type = match.group(2) if match else 'other'
+            is_report = bool(match) and match.group(1) == 'Report'
+            date = match.group(3) if match else None
+
+            stats = storage.setdefault(test_type, {'objects': 0, 'bytes': 0, 'report_bytes': 0,
+                                                   'dates': set(), 'buckets': set()})
+            stats['objects'] += 1
+            stats['bytes'] += size
+            stats['buckets'].add(bucket)
+            if is_report:
+                stats['report_bytes'] += size
+            elif date:
+                stats['dates'].add(date)
+        print(f"  {rows} inventory rows processed")
+
+    return storage
+
+def get_cost_by_tag(start_date=None, end_date=None):
+    """Get cost data by cost-usage tag (previous month by default)"""
+    if start_date is None:
+        start_date, end_date = get_previous_month_dates()
 
-    # Query to get data by tag
-    cmd = [
-        'aws', 'ce', 'get-cost-and-usage',
-        '--time-period', f'Start={start_date},End={end_date}',
-        '--granularity', 'DAILY',
-        '--metrics', 'BlendedCost',
-        '--group-by', 'Type=TAG,Key=cost-usage',
-        '--output', 'json'
-    ]
+    print(f"Retrieving data for tag 'cost-usage' for period: {start_date} - {end_date}")
 
     try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        return json.loads(result.stdout), start_date, end_date
-    except subprocess.CalledProcessError as e:
-        print(f"AWS CLI error: {e}")
-        print(f"Stderr: {e.stderr}")
-        return None, start_date, end_date
-    except json.JSONDecodeError as e:
-        print(f"JSON decoding error: {e}")
+        data = ce_request(
+            'get_cost_and_usage',
+            TimePeriod={'Start': start_date, 'End': end_date},
+            Granularity='DAILY',
+            Metrics=['BlendedCost'],
+            GroupBy=[{'Type': 'TAG', 'Key': 'cost-usage'}]
+        )
+        return data, start_date, end_date
+    except (BotoCoreError, ClientError) as e:
+        print(f"AWS Cost Explorer error: {e}")
         return None, start_date, end_date
 
-def generate_reports(data, start_date, end_date):
-    """Generate CSV and XLS reports"""
-    if not data or 'ResultsByTime' not in data:
-        print("No data available for report generation")
-        return
+def get_current_month_dates():
+    """Get month-to-date period and the remaining forecast period of the current month"""
+    today = datetime.now()
+    first_day_current = today.replace(day=1)
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    first_day_next = first_day_current + timedelta(days=days_in_month)
+
+    return (first_day_current.strftime('%Y-%m-%d'),
+            today.strftime('%Y-%m-%d'),
+            first_day_next.strftime('%Y-%m-%d'))
 
+def get_cost_usage_values():
+    """Get values of the cost-usage tag seen from the previous month up to today"""
+    start_date, _ = get_previous_month_dates()
+    end_date = datetime.now().strftime('%Y-%m-%d')
+
+    # Same request for the tag check and the forecasts, so the second call is a cache hit
+    try:
+        data = ce_request('get_tags', TimePeriod={'Start': start_date, 'End': end_date}, TagKey='cost-usage')
+        return sorted(value for value in data.get('Tags', []) if value)
+    except (BotoCoreError, ClientError) as e:
+        print(f"Error getting cost-usage values: {e}")
+        return []
+
+def get_tag_forecast(tag_value, start_date, end_date):
+    """Cost Explorer forecast for one cost-usage value ('untagged' = tag absent, None = all costs)"""
+    params = {
+        'TimePeriod': {'Start': start_date, 'End': end_date},
+        'Metric': 'BLENDED_COST',
+        'Granularity': 'MONTHLY'
+    }
+    if tag_value == 'untagged':
+        params['Filter'] = {'Tags': {'Key': 'cost-usage', 'MatchOptions': ['ABSENT']}}
+    elif tag_value is not None:
+        params['Filter'] = {'Tags': {'Key': 'cost-usage', 'Values': [tag_value], 'MatchOptions': ['EQUALS']}}
+
+    try:
+        data = ce_request('get_cost_forecast', **params)
+        return float(data['Total']['Amount'])
+    except (BotoCoreError, ClientError) as e:
+        # e.g. DataUnavailableException for tags without enough history
+        print(f"Note: no forecast for '{tag_value or 'TOTAL'}': {e}")
+        return None
+
+def submit_forecast_requests(executor):
+    """Submit month-to-date actuals and per cost-usage value forecasts to the executor"""
+    month_start, today, next_month = get_current_month_dates()
+    print(f"Retrieving forecast for period: {today} - {next_month}")
+
+    tag_values = get_cost_usage_values()
+    requests = {
+        'period': (month_start, today, next_month),
+        'mtd': executor.submit(get_cost_by_tag, month_start, today) if today > month_start else None,
+        'total': executor.submit(get_tag_forecast, None, today, next_month),
+        'tags': {tag: executor.submit(get_tag_forecast, tag, today, next_month)
+                 for tag in tag_values + ['untagged']}
+    }
+    return requests
+
+def build_forecast(requests, last_month_data):
+    """Combine Cost Explorer forecasts with a run-rate projection from the tags x dates matrix"""
+    month_start, today, next_month = requests['period']
+    remaining_days = (datetime.strptime(next_month, '%Y-%m-%d') - datetime.strptime(today, '%Y-%m-%d')).days
+
+    mtd_data = requests['mtd'].result()[0] if requests['mtd'] else None
+    _, mtd_dates, mtd_costs = build_cost_matrix(mtd_data)
+    _, last_dates, last_costs = build_cost_matrix(last_month_data)
+
+    # Trailing window over last month followed by month-to-date, without 1st-of-month charges:
+    # they are already in the month-to-date actuals and do not recur in the remaining days
+    dates = [date for date in sorted(set(last_dates) | set(mtd_dates)) if not date.endswith('-01')]
+    dates = dates[-RUN_RATE_DAYS:]
+    tags = sorted(set(mtd_costs) | set(last_costs) | set(requests['tags']))
+
+    forecast_tags = {}
+    for tag in tags:
+        mtd = sum(float(cost) for cost in mtd_costs.get(tag, {}).values() if cost)
+        window = [float(mtd_costs.get(tag, {}).get(date) or last_costs.get(tag, {}).get(date) or 0)
+                  for date in dates]
+        daily_rate = sum(window) / len(window) if window else 0.0
+        future = requests['tags'].get(tag)
+        remaining = future.result() if future else None
+        forecast_tags[tag] = {
+            'month_to_date': mtd,
+            'forecast_remaining': remaining,
+            'forecast_total': mtd + remaining if remaining is not None else None,
+            'daily_run_rate': daily_rate,
+            'run_rate_total': mtd + daily_rate * remaining_days
+        }
+
+    total_mtd = sum(t['month_to_date'] for t in forecast_tags.values())
+    total_remaining = requests['total'].result()
+    return {
+        'month': month_start[:7],
+        'period_start': month_start,
+        'forecast_start': today,
+        'period_end': next_month,
+        'remaining_days': remaining_days,
+        'run_rate_days': len(dates),
+        'month_to_date': total_mtd,
+        'forecast_remaining': total_remaining,
+        'forecast_total': total_mtd + total_remaining if total_remaining is not None else None,
+        'daily_run_rate': sum(t['daily_run_rate'] for t in forecast_tags.values()),
+        'run_rate_total': sum(t['run_rate_total'] for t in forecast_tags.values()),
+        'tags': forecast_tags
+    }
+
+def build_cost_matrix(data):
+    """Build sorted tag values, sorted dates and {tag: {date: cost}} from a Cost Explorer response"""
     # Collect data
     tag_values = set()
     dates = []
     cost_data = {}
 
     # Process AWS data
-    for result in data['ResultsByTime']:
+    for result in (data or {}).get('ResultsByTime', []):
         date = result['TimePeriod']['Start']
         dates.append(date)
 
@@ -96,11 +359,59 @@ def generate_reports(data, start_date, end_date):
     dates.sort()
     tag_values = sorted(tag_values)
 
+    return tag_values, dates, cost_data
+
+def generate_reports(data, start_date, end_date, storage=None, forecast=None):
+    """Generate CSV, XLS and JSON summary reports"""
+    if not data or 'ResultsByTime' not in data:
+        print("No data available for report generation")
+        return
+
+    tag_values, dates, cost_data = build_cost_matrix(data)
+
     # Generate CSV
     generate_csv(tag_values, dates, cost_data)
 
     # Generate XLS
-    generate_xls(tag_values, dates, cost_data, start_date, end_date)
+    generate_xls(tag_values, dates, cost_data, start_date, end_date, storage, forecast)
+
+    # Generate JSON summary
+    generate_summary(tag_values, cost_data, start_date, end_date, forecast)
+
+def generate_summary(tag_values, cost_data, start_date, end_date, forecast=None):
+    """Generate JSON summary for the workflow (totals and optional forecast fields)"""
+    filename = 'costs-summary.json'
+
+    tag_totals = {tag: round(sum(float(cost) for cost in cost_data.get(tag, {}).values() if cost), 2)
+                  for tag in tag_values}
+    summary = {
+        'period_start': start_date,
+        'period_end': end_date,
+        'total_cost': round(sum(tag_totals.values()), 2),
+        'tag_totals': tag_totals
+    }
+
+    if forecast:
+        def rounded(value):
+            return round(value, 2) if value is not None else None
+
+        summary.update({
+            'forecast_month': forecast['month'],
+            'forecast_month_to_date': rounded(forecast['month_to_date']),
+            'forecast_remaining': rounded(forecast['forecast_remaining']),
+            'forecast_total': rounded(forecast['forecast_total']),
+            'daily_run_rate': rounded(forecast['daily_run_rate']),
+            'run_rate_total': rounded(forecast['run_rate_total']),
+            'forecast_by_tag': {
+                tag: {key: rounded(value) for key, value in values.items()}
+                for tag, values in forecast['tags'].items()
+            }
+        })
+
+    with open(filename, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
+
+    print(f"JSON summary saved to: {filename}")
 
 def generate_csv(tag_values, dates, cost_data):
     """Generate CSV file"""
@@ -155,7 +466,7 @@ def generate_csv(tag_values, dates, cost_data):
 
     print(f"CSV report saved to: {filename}")
 
-def generate_xls(tag_values, dates, cost_data, start_date, end_date):
+def generate_xls(tag_values, dates, cost_data, start_date, end_date, storage=None, forecast=None):
     """Generate XLS file with formatting"""
     filename = 'costs.xlsx'
 
@@ -501,34 +812,174 @@ Note: The 'untagged' line typically shows a significant spike on the 1st of the
                 pass
         info_ws.column_dimensions[column_letter].width = max_length + 2
 
+    if storage:
+        qstp_cost = sum(float(cost) for cost in cost_data.get(QSTP_TAG, {}).values() if cost)
+        add_storage_sheet(wb, storage, qstp_cost)
+
+    if forecast:
+        add_forecast_sheet(wb, forecast)
+
     wb.save(filename)
     print(f"XLS report saved to: {filename}")
 
-def check_available_tags():
-    """Check available tags"""
-    start_date, end_date = get_previous_month_dates()
+def add_storage_sheet(wb, storage, qstp_cost):
+    """Add sheet splitting the qstp tag cost by test type proportionally to stored bytes"""
+    ws = wb.create_sheet("qstp by test type")
+
+    header_font = Font(bold=True, size=12, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    total_font = Font(bold=False, color="FF0000", size=11)
+    total_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    border = Border(left=Side(style='thin'),
+                    right=Side(style='thin'),
+                    top=Side(style='thin'),
+                    bottom=Side(style='thin'))
+
+    headers = ['Test type', 'Buckets', 'Objects', 'Size (GB)', 'of which reports (GB)', 'Date partitions',
+               'Latest partition', 'Share of bytes (%)', 'Attributed cost($)']
+    for col, title in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center', vertical='center')
+
+    total_bytes = sum(stats['bytes'] for stats in storage.values())
+    total_objects = sum(stats['objects'] for stats in storage.values())
+
+    # Largest consumers first
+    ordered = sorted(storage.items(), key=lambda item: item[1]['bytes'], reverse=True)
+    for row_idx, (test_type, stats) in enumerate(ordered, 2):
+        share = stats['bytes'] / total_bytes if total_bytes else 0.0
+        values = [test_type,
+                  ', '.join(sorted(stats['buckets'])),
+                  stats['objects'],
+                  stats['bytes'] / 1024 ** 3,
+                  stats['report_bytes'] / 1024 ** 3,
+                  len(stats['dates']),
+                  max(stats['dates']) if stats['dates'] else '',
+                  share * 100,
+                  qstp_cost * share]
+        for col, value in enumerate(values, 1):
+            cell = ws.cell(row=row_idx, column=col, value=value)
+            cell.border = border
+            if col in (4, 5, 8, 9):
+                cell.number_format = '0.00'
+
+    total_row_idx = len(ordered) + 2
+    total_report_bytes = sum(stats['report_bytes'] for stats in storage.values())
+    totals = ['TOTAL', '', total_objects, total_bytes / 1024 ** 3, total_report_bytes / 1024 ** 3, '', '',
+              100.0 if total_bytes else 0.0, qstp_cost]
+    for col, value in enumerate(totals, 1):
+        cell = ws.cell(row=total_row_idx, column=col, value=value)
+        cell.font = total_font
+        cell.fill = total_fill
+        cell.border = border
+        if col in (4, 5, 8, 9):
+            cell.number_format = '0.00'
+
+    note_row = total_row_idx + 2
+    ws.cell(row=note_row, column=1,
+            value=f"The '{QSTP_TAG}' tag cost is split by each test type's share of bytes stored in "
+                  f"{', '.join(QSTP_BUCKETS)} (S3 Inventory), "
+                  f"counting results (Result/<test-type>/) and generated reports (Report/<test-type>/). "
+                  f"'other' = keys outside both.")
+
+    for column in ws.iter_cols(min_row=1, max_row=total_row_idx):
+        max_length = max(len(str(cell.value)) for cell in column if cell.value is not None)
+        ws.column_dimensions[column[0].column_letter].width = min(max_length + 4, 50)
+
+    ws.freeze_panes = 'B2'
+    print(f"✓ Added qstp storage attribution for {len(storage)} test types")
+
+def add_forecast_sheet(wb, forecast):
+    """Add sheet with month-to-date actuals, Cost Explorer forecast and run-rate projection"""
+    ws = wb.create_sheet("Forecast")
+
+    header_font = Font(bold=True, size=12, color="FFFFFF")
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    total_font = Font(bold=False, color="FF0000", size=11)
+    total_fill = PatternFill(start_color="FFF2CC", end_color="FFF2CC", fill_type="solid")
+    border = Border(left=Side(style='thin'),
+                    right=Side(style='thin'),
+                    top=Side(style='thin'),
+                    bottom=Side(style='thin'))
+
+    headers = ['Tag value (cost-usage)', 'Month-to-date($)', 'Forecast rest of month($)',
+               'Forecast month total($)', 'Daily run-rate($)', 'Run-rate month total($)',
+               'Forecast - run-rate($)']
+    for col, title in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=title)
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.border = border
+        cell.alignment = Alignment(horizontal='center', vertical='center')
 
-    cmd = [
-        'aws', 'ce', 'get-tags',
-        '--time-period', f'Start={start_date},End={end_date}',
-        '--output', 'json'
+    def row_values(label, values):
+        difference = None
+        if values['forecast_total'] is not None:
+            difference = values['forecast_total'] - values['run_rate_total']
+        return [label, values['month_to_date'], values['forecast_remaining'], values['forecast_total'],
+                values['daily_run_rate'], values['run_rate_total'], difference]
+
+    rows = [row_values(tag, values) for tag, values in sorted(forecast['tags'].items())]
+    rows.append(row_values('TOTAL', forecast))
+
+    for row_idx, values in enumerate(rows, 2):
+        is_total = row_idx == len(rows) + 1
+        for col, value in enumerate(values, 1):
+            # Empty cells where Cost Explorer has no forecast (not enough history)
+            cell = ws.cell(row=row_idx, column=col, value=value)
+            cell.border = border
+            if col > 1:
+                cell.number_format = '0.00'
+                cell.alignment = Alignment(horizontal='right', vertical='center')
+            if is_total:
+                cell.font = total_font
+                cell.fill = total_fill
+
+    info_row = len(rows) + 3
+    info = [
+        ['Month:', forecast['month']],
+        ['Forecast period:', f"{forecast['forecast_start']} to {forecast['period_end']}"],
+        ['Run-rate:', f"month-to-date + average of the last {forecast['run_rate_days']} days "
+                      f"(1st of month excluded) x {forecast['remaining_days']} remaining days"],
+        ['Data Source:', 'AWS Cost Explorer (GetCostForecast, BlendedCost)']
     ]
+    for offset, (key, value) in enumerate(info):
+        ws.cell(row=info_row + offset, column=1, value=key)
+        ws.cell(row=info_row + offset, column=2, value=value)
 
-    try:
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        data = json.loads(result.stdout)
+    for col in range(1, len(headers) + 1):
+        column_letter = ws.cell(row=1, column=col).column_letter
+        ws.column_dimensions[column_letter].width = max(len(headers[col - 1]) + 4, 14)
 
-        print("Available tags in AWS Cost Explorer:")
-        for tag in sorted(data.get('Tags', [])):
-            print(f"  - {tag}")
+    ws.freeze_panes = 'B2'
+    print("✓ Added Forecast sheet")
+
+def check_available_tags():
+    """Check that the cost-usage tag has values"""
+    tag_values = get_cost_usage_values()
 
-        return 'cost-usage' in data.get('Tags', [])
-    except Exception as e:
-        print(f"Error checking tags: {e}")
-        return False
+    print("Available 'cost-usage' values in AWS Cost Explorer:")
+    for tag in tag_values:
+        print(f"  - {tag}")
+
+    return bool(tag_values)
 
 def main():
     """Main function"""
+    parser = argparse.ArgumentParser(description="AWS cost report by 'cost-usage' tag")
+    parser.add_argument('--inventory', action='append', default=[],
+                        help="S3 Inventory manifest.json, CSV(.gz) or Parquet file for the qstp buckets "
+                             "(repeatable; Parquet needs pyarrow)")
+    parser.add_argument('--inventory-schema', default=None,
+                        help="Column order of CSV inventory files passed without manifest.json "
+                             "(the manifest's fileSchema, e.g. 'Bucket, Key, Size')")
+    parser.add_argument('--forecast', action='store_true',
+                        help="Add current month forecast and run-rate projection (Forecast sheet, JSON fields)")
+    args = parser.parse_args()
+
     print("=" * 60)
     print("AWS Cost Report Generator for tag 'cost-usage'")
     print("=" * 60)
@@ -537,15 +988,23 @@ def main():
     if not check_available_tags():
         print("Warning: tag 'cost-usage' might be missing or not available in the selected period")
 
-    # Get data
-    data, start_date, end_date = get_cost_by_tag()
+    # Get data; forecast requests run concurrently with the actuals on the shared client
+    with ThreadPoolExecutor(max_workers=CE_MAX_WORKERS) as executor:
+        actuals = executor.submit(get_cost_by_tag)
+        forecast_requests = submit_forecast_requests(executor) if args.forecast else None
+
+        storage = get_qstp_storage(args.inventory, parse_inventory_schema(args.inventory_schema or '')) if args.inventory else None
+
+        data, start_date, end_date = actuals.result()
+        forecast = build_forecast(forecast_requests, data) if forecast_requests else None
 
     if data:
-        generate_reports(data, start_date, end_date)
+        generate_reports(data, start_date, end_date, storage, forecast)
         print("\n" + "=" * 60)
         print("✓ Reports generated successfully!")
         print("  - costs.csv")
         print("  - costs.xlsx")
+        print("  - costs-summary.json")
         print("=" * 60)
     else:
         print("Failed to retrieve data from AWS")
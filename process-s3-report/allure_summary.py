@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Allure results summary for the process-s3-report workflow.
+
+Replaces the per-file jq loop of the "Calculate test pass rate" step.
+Walks the downloaded results directory once, parses the *.json files in
+parallel worker processes and aggregates:
+    - passed / skipped / unknown / other counts and the pass rate
+      (skipped and unknown are excluded from the rate, as in Allure)
+    - the same counts per test type
+    - the slowest tests (by Allure start/stop timestamps)
+
+Status rules match the previous jq expression:
+    .status // .result // .state // "unknown"  (lower-cased)
+A file that cannot be parsed counts as 'unknown' (jq failed -> "unknown"),
+an empty or whitespace-only file counts as 'other' (jq printed nothing -> "").
+
+Usage:
+    python3 allure_summary.py ./allure-results \
+        --test-type consul \
+        --summary allure-summary.json \
+        --github-output "$GITHUB_OUTPUT"
+"""
+
+import argparse
+import heapq
+import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+PASSED_STATUSES = {'passed', 'pass', 'success'}
+SKIPPED_STATUSES = {'skipped', 'skip'}
+
+# Marker for empty files: jq prints nothing for them, so the old loop saw status ""
+EMPTY_FILE = object()
+
+# Files handed to one worker task; keeps IPC overhead low for thousands of tiny files
+CHUNK_SIZE = 256
+
+
+def find_json_files(source_dir):
+    """Yield every *.json file below source_dir (same set as `find -name "*.json"`)"""
+    stack = [source_dir]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file() and entry.name.endswith('.json'):
+                        yield entry.path
+        except OSError as e:
+            print(f"⚠️  Cannot read directory {current}: {e}", file=sys.stderr)
+
+
+def chunked(iterable, size):
+    """Split an iterable into lists of at most `size` items"""
+    chunk = []
+    for item in iterable:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def test_type_for(path, source_dir, default_type):
+    """Take the test type from a Result/<test-type>/ path component, if any"""
+    parts = os.path.relpath(path, source_dir).split(os.sep)
+    for idx, part in enumerate(parts[:-1]):
+        if part == 'Result' and idx + 1 < len(parts) - 1:
+            return parts[idx + 1]
+    return default_type
+
+
+def read_status(data):
+    """Apply the jq fallback chain `.status // .result // .state // "unknown"`"""
+    if data is EMPTY_FILE:
+        return ''
+    if isinstance(data, dict):
+        for field in ('status', 'result', 'state'):
+            value = data.get(field)
+            # jq's // operator skips null and false
+            if value is not None and value is not False:
+                if isinstance(value, str):
+                    return value.lower()
+                return json.dumps(value).lower()
+    return 'unknown'
+
+
+def classify(status):
+    """Map a lower-cased status to one of passed/skipped/unknown/other"""
+    if status in PASSED_STATUSES:
+        return 'passed'
+    if status in SKIPPED_STATUSES:
+        return 'skipped'
+    if status == 'unknown':
+        return 'unknown'
+    return 'other'
+
+
+def summarize_chunk(paths, source_dir, default_type, top_n):
+    """
+    Parse a batch of result files in a worker process.
+
+    Returns only small partial aggregates (counters and a top-N list), so the
+    parent never holds parsed JSON documents.
+    """
+    counts = Counter()
+    statuses = Counter()
+    by_type = {}
+    slowest = []
+
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                raw = f.read()
+            data = json.loads(raw) if raw.strip() else EMPTY_FILE
+        except (OSError, ValueError):
+            data = None
+
+        status = read_status(data)
+        category = classify(status)
+        test_type = test_type_for(path, source_dir, default_type)
+
+        counts[category] += 1
+        statuses[status] += 1
+        by_type.setdefault(test_type, Counter())[category] += 1
+
+        if isinstance(data, dict):
+            start, stop = data.get('start'), data.get('stop')
+            if isinstance(start, (int, float)) and isinstance(stop, (int, float)) and stop >= start:
+                entry = (
+                    stop - start,
+                    str(data.get('fullName') or data.get('name') or os.path.basename(path)),
+                    status,
+                    test_type,
+                    os.path.relpath(path, source_dir),
+                )
+                if len(slowest) < top_n:
+                    heapq.heappush(slowest, entry)
+                elif top_n:
+                    heapq.heappushpop(slowest, entry)
+
+    return counts, statuses, by_type, slowest
+
+
+def pass_rate(counts):
+    """
+    Pass rate over executed tests (skipped and unknown excluded).
+
+    Truncated to two decimals like the former `bc` (scale=2) calculation.
+    Returns None when nothing was executed.
+    """
+    total = sum(counts.values())
+    executed = total - counts['skipped'] - counts['unknown']
+    if executed <= 0:
+        return None
+    hundredths = counts['passed'] * 10000 // executed
+    return f"{hundredths // 100}.{hundredths % 100:02d}"
+
+
+def build_summary(counts, statuses, by_type, slowest):
+    """Assemble the JSON summary document"""
+    def section(c):
+        total = sum(c.values())
+        return {
+            'total': total,
+            'passed': c['passed'],
+            'skipped': c['skipped'],
+            'unknown': c['unknown'],
+            'other': c['other'],
+            'executed': total - c['skipped'] - c['unknown'],
+            'pass_rate': pass_rate(c),
+        }
+
+    summary = section(counts)
+    summary['statuses'] = dict(statuses.most_common())
+    summary['by_test_type'] = {t: section(c) for t, c in sorted(by_type.items())}
+    summary['slowest_tests'] = [
+        {
+            'name': name,
+            'duration_ms': duration,
+            'status': status,
+            'test_type': test_type,
+            'file': path,
+        }
+        for duration, name, status, test_type, path in sorted(slowest, reverse=True)
+    ]
+    return summary
+
+
+def summarize(source_dir, default_type='unknown', top_n=10, workers=None):
+    """Aggregate all result files below source_dir using a process pool"""
+    counts = Counter()
+    statuses = Counter()
+    by_type = {}
+    slowest = []
+
+    chunks = chunked(find_json_files(source_dir), CHUNK_SIZE)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(summarize_chunk, chunk, source_dir, default_type, top_n)
+            for chunk in chunks
+        ]
+        for future in futures:
+            part_counts, part_statuses, part_by_type, part_slowest = future.result()
+            counts.update(part_counts)
+            statuses.update(part_statuses)
+            for test_type, c in part_by_type.items():
+                by_type.setdefault(test_type, Counter()).update(c)
+            slowest = heapq.nlargest(top_n, slowest + part_slowest)
+
+    for key in ('passed', 'skipped', 'unknown', 'other'):
+        counts.setdefault(key, 0)
+
+    return build_summary(counts, statuses, by_type, slowest)
+
+
+def write_github_output(summary, output_path):
+    """Append the step outputs previously produced by the bash loop"""
+    if summary['total'] == 0:
+        rate = 'No data'
+    elif summary['pass_rate'] is None:
+        rate = 'No tests executed'
+    else:
+        rate = f"{summary['pass_rate']}%"
+
+    with open(output_path, 'a', encoding='utf-8') as f:
+        f.write(f"PASS_RATE={rate}\n")
+        f.write(f"TOTAL_TESTS={summary['total']}\n")
+        f.write(f"PASSED_TESTS={summary['passed']}\n")
+        f.write(f"SKIPPED_TESTS={summary['skipped']}\n")
+        f.write(f"UNKNOWN_TESTS={summary['unknown']}\n")
+        f.write(f"OTHER_TESTS={summary['other']}\n")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Summarize Allure result JSON files')
+    parser.add_argument('source_dir', help='Directory with downloaded Allure results')
+    parser.add_argument('--test-type', default='unknown',
+                        help='Test type for files outside a Result/<test-type>/ path')
+    parser.add_argument('--summary', help='Write the JSON summary to this file')
+    parser.add_argument('--github-output', help='Append step outputs to this file ($GITHUB_OUTPUT)')
+    parser.add_argument('--top', type=int, default=10, help='Number of slowest tests to report')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Worker processes (default: number of CPUs)')
+    args = parser.parse_args()
+
+    summary = summarize(args.source_dir, args.test_type, max(args.top, 0), args.workers)
+
+    print("=== Summary ===")
+    print(f"Total JSON files: {summary['total']}")
+    print(f"Passed: {summary['passed']}")
+    print(f"Skipped: {summary['skipped']}")
+    print(f"Unknown: {summary['unknown']}")
+    print(f"Other (failed/broken/etc): {summary['other']}")
+    for status, count in summary['statuses'].items():
+        print(f"  {status}: {count}")
+    for test in summary['slowest_tests']:
+        print(f"  🐢 {test['duration_ms'] / 1000:.1f}s {test['name']} ({test['status']})")
+
+    rate = summary['pass_rate']
+    print(f"📊 Test Summary: Total={summary['total']}, Passed={summary['passed']}, "
+          f"Skipped={summary['skipped']}, Unknown={summary['unknown']}, "
+          f"Executed={summary['executed']}, Rate={rate + '%' if rate else 'n/a'}")
+
+    if args.summary:
+        with open(args.summary, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+        print(f"JSON summary saved to: {args.summary}")
+
+    if args.github_output:
+        write_github_output(summary, args.github_output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Per-run bundles of Allure result files for the qubership-testing-results store.
+
+Every test run adds thousands of small *-result.json files to the results
+repository. This tool packs each run directory
+
+    Result/<test-type>/YYYY-MM-DD/HH-MM-SS/**/*-result.json
+
+(results usually sit in a nested allure-results/ folder) into two files
+next to it:
+
+    Result/<test-type>/YYYY-MM-DD/HH-MM-SS.ndjson.gz   compressed NDJSON, one result per line
+    Result/<test-type>/YYYY-MM-DD/HH-MM-SS.index.json  test name, status, duration, byte offsets
+
+Index entries name each file by its path relative to the run directory
+(e.g. allure-results/<uuid>-result.json); extraction recreates the folders.
+
+The bundle is a sequence of independent gzip members of up to BLOCK_RECORDS
+lines each, so `gzip -dc` still reads it as one NDJSON stream, while the
+index points at (offset, length, line) of every record: reading one test
+decompresses a single block instead of the whole bundle.
+
+Packing a run that already has a bundle appends only new or changed files;
+changed files are re-pointed in the index to the appended copy. The older
+copy stays in the bundle, so `gzip -dc` also returns stale records for such
+files; only the index tells which record is current.
+
+Records are stored as compact re-serialised JSON, so extracted files are
+equivalent Allure documents but not byte-identical to the originals.
+
+Index entries also keep the MD5 and size of the original file, i.e. the S3
+ETag of a result object: sync_results.py uses them to treat bundled results
+as already synced when its manifest is lost.
+
+Usage:
+    python3 bundle_results.py pack /tmp/qubership-testing-results/Result --remove
+    python3 bundle_results.py extract Result/consul/2025-12-10/00-42-50.ndjson.gz --out ./allure-results
+    python3 bundle_results.py get Result/consul/2025-12-10/00-42-50.ndjson.gz --name "tests.consul.LeaderTest.test_leader_election"
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from allure_summary import EMPTY_FILE, read_status
+
+INDEX_VERSION = 1
+RESULT_SUFFIX = '-result.json'
+BUNDLE_SUFFIX = '.ndjson.gz'
+INDEX_SUFFIX = '.index.json'
+
+# Records per gzip member: bigger blocks compress better, smaller ones read faster
+BLOCK_RECORDS = 64
+
+
+def index_path_for(bundle_path):
+    """Index file that belongs to a bundle"""
+    return bundle_path[:-len(BUNDLE_SUFFIX)] + INDEX_SUFFIX
+
+
+def iter_result_files(run_dir):
+    """Yield (path relative to the run with '/' separators, absolute path) of result files below run_dir"""
+    for current, dirs, files in os.walk(run_dir):
+        dirs.sort()
+        for file_name in sorted(files):
+            if file_name.endswith(RESULT_SUFFIX):
+                path = os.path.join(current, file_name)
+                yield os.path.relpath(path, run_dir).replace(os.sep, '/'), path
+
+
+def find_run_dirs(root):
+    """Yield Result/<test-type>/<date>/<time>/ directories that contain result files at any depth"""
+    for test_type in sorted(os.listdir(root)):
+        type_dir = os.path.join(root, test_type)
+        if not os.path.isdir(type_dir):
+            continue
+        for date in sorted(os.listdir(type_dir)):
+            date_dir = os.path.join(type_dir, date)
+            if not os.path.isdir(date_dir):
+                continue
+            for run in sorted(os.listdir(date_dir)):
+                run_dir = os.path.join(date_dir, run)
+                if os.path.isdir(run_dir) and next(iter_result_files(run_dir), None):
+                    yield run_dir
+
+
+def load_index(index_path, run):
+    """Load an existing index or start an empty one"""
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('version') == INDEX_VERSION:
+            return index
+        print(f"⚠️  Unsupported index version in {index_path}, rebuilding", file=sys.stderr)
+    except FileNotFoundError:
+        pass
+    return {'version': INDEX_VERSION, 'run': run, 'tests': []}
+
+
+def save_index(index, index_path):
+    """Write the index atomically, one compact test entry per line"""
+    tmp_path = f"{index_path}.tmp"
+    tests = ',\n'.join(json.dumps(entry, separators=(',', ':'), sort_keys=True) for entry in index['tests'])
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(f'{{"version":{index["version"]},"run":{json.dumps(index["run"])},"tests":[\n{tests}\n]}}\n')
+    os.replace(tmp_path, index_path)
+
+
+def describe(data, file_name):
+    """Index fields taken from an Allure result document"""
+    if not isinstance(data, dict):
+        # Same status as allure_summary.py: '' for empty files, 'unknown' for unparsable ones
+        return {'name': file_name, 'status': read_status(data), 'duration': None}
+    start, stop = data.get('start'), data.get('stop')
+    duration = stop - start if isinstance(start, (int, float)) and isinstance(stop, (int, float)) else None
+    return {
+        'name': str(data.get('fullName') or data.get('name') or file_name),
+        'status': read_status(data),
+        'duration': duration,
+    }
+
+
+def pack_run(run_dir, remove=False):
+    """
+    Pack one run directory into its bundle and index.
+
+    Returns (packed, skipped) file counts.
+    """
+    date_dir, run = os.path.split(run_dir.rstrip(os.sep))
+    bundle_path = os.path.join(date_dir, run + BUNDLE_SUFFIX)
+    index_path = index_path_for(bundle_path)
+
+    index = load_index(index_path, '/'.join(run_dir.rstrip(os.sep).split(os.sep)[-3:]))
+    known = {entry['file']: entry for entry in index['tests']}
+
+    pending = []
+    skipped = 0
+    for file_name, path in iter_result_files(run_dir):
+        with open(path, 'rb') as f:
+            raw = f.read()
+        sha1 = hashlib.sha1(raw).hexdigest()
+        md5 = hashlib.md5(raw).hexdigest()
+        if file_name in known and known[file_name]['sha1'] == sha1:
+            skipped += 1
+            continue
+        try:
+            if not raw.strip():
+                raise ValueError('empty result file')
+            data = json.loads(raw)
+            line = json.dumps(data, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        except ValueError:
+            # Keep unparsable files as a JSON string so extraction restores them as they were
+            data = EMPTY_FILE if not raw.strip() else None
+            line = json.dumps({'_raw': raw.decode('utf-8', errors='replace')}).encode('utf-8')
+        entry = {'file': file_name, 'sha1': sha1, 'md5': md5, 'size': len(raw)}
+        entry.update(describe(data, file_name))
+        pending.append((entry, line))
+
+    if pending:
+        with open(bundle_path, 'ab') as bundle:
+            offset = bundle.tell()
+            for start in range(0, len(pending), BLOCK_RECORDS):
+                block = pending[start:start + BLOCK_RECORDS]
+                member = gzip.compress(b''.join(line + b'\n' for _, line in block), mtime=0)
+                bundle.write(member)
+                for line_no, (entry, _) in enumerate(block):
+                    entry.update({'offset': offset, 'length': len(member), 'line': line_no})
+                    known[entry['file']] = entry
+                offset += len(member)
+
+        index['tests'] = sorted(known.values(), key=lambda e: e['file'])
+        save_index(index, index_path)
+
+    if remove:
+        for _, path in list(iter_result_files(run_dir)):
+            os.remove(path)
+        # Drop folders left empty, deepest first
+        for current, _, _ in sorted(os.walk(run_dir), key=lambda item: item[0].count(os.sep), reverse=True):
+            if not os.listdir(current):
+                os.rmdir(current)
+
+    return len(pending), skipped
+
+
+def read_block(bundle, entry):
+    """Decompress the single gzip member that holds an index entry"""
+    bundle.seek(entry['offset'])
+    return gzip.decompress(bundle.read(entry['length'])).split(b'\n')
+
+
+def decode_record(line):
+    """Turn a stored NDJSON line back into result file content (re-serialised, not the original bytes)"""
+    data = json.loads(line)
+    if isinstance(data, dict) and set(data) == {'_raw'}:
+        return data['_raw'].encode('utf-8')
+    return json.dumps(data, ensure_ascii=False).encode('utf-8')
+
+
+def iter_records(bundle_path, entries):
+    """Yield (entry, content) for index entries, decompressing each block once"""
+    with open(bundle_path, 'rb') as bundle:
+        cached_key, lines = None, None
+        for entry in sorted(entries, key=lambda e: (e['offset'], e['line'])):
+            key = (entry['offset'], entry['length'])
+            if key != cached_key:
+                cached_key, lines = key, read_block(bundle, entry)
+            yield entry, decode_record(lines[entry['line']])
+
+
+def select_entries(index, names=None, statuses=None, files=None):
+    """Filter index entries by test name, status or file name"""
+    entries = index['tests']
+    if names:
+        entries = [e for e in entries if e['name'] in names]
+    if statuses:
+        wanted = {s.lower() for s in statuses}
+        entries = [e for e in entries if e['status'] in wanted]
+    if files:
+        # Match the path inside the run or just the file name
+        entries = [e for e in entries if e['file'] in files or e['file'].rsplit('/', 1)[-1] in files]
+    return entries
+
+
+def cmd_pack(args):
+    """Pack every run below the results root"""
+    run_dirs = list(find_run_dirs(args.root))
+    print(f"📦 Packing {len(run_dirs)} runs from {args.root}")
+
+    packed = skipped = 0
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [executor.submit(pack_run, run_dir, args.remove) for run_dir in run_dirs]
+        for run_dir, future in zip(run_dirs, futures):
+            run_packed, run_skipped = future.result()
+            packed += run_packed
+            skipped += run_skipped
+            if run_packed:
+                print(f"  ✅ {run_dir}: {run_packed} packed, {run_skipped} unchanged")
+
+    print(f"✅ {packed} result files packed, {skipped} already in bundles")
+
+
+def cmd_extract(args):
+    """Rebuild Allure result files from a bundle"""
+    with open(index_path_for(args.bundle), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    entries = select_entries(index, args.name, args.status, args.file)
+
+    os.makedirs(args.out, exist_ok=True)
+    for entry, content in iter_records(args.bundle, entries):
+        path = os.path.join(args.out, *entry['file'].split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(content)
+
+    print(f"✅ Extracted {len(entries)} result files to {args.out}")
+
+
+def cmd_get(args):
+    """Print selected results using the index (random access)"""
+    with open(index_path_for(args.bundle), 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    entries = select_entries(index, args.name, args.status, args.file)
+    if not entries:
+        print("❌ No matching tests in index", file=sys.stderr)
+        sys.exit(1)
+
+    for _, content in iter_records(args.bundle, entries):
+        sys.stdout.write(content.decode('utf-8') + '\n')
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Bundle Allure result files per test run')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    pack = subparsers.add_parser('pack', help='Pack Result/<type>/<date>/<time>/ runs into bundles')
+    pack.add_argument('root', help='Results root (the Result/ directory)')
+    pack.add_argument('--remove', action='store_true', help='Delete result files once packed')
+    pack.add_argument('--workers', type=int, default=None, help='Worker processes (default: number of CPUs)')
+    pack.set_defaults(func=cmd_pack)
+
+    for name, func, help_text in (('extract', cmd_extract, 'Rebuild result files from a bundle'),
+                                  ('get', cmd_get, 'Print results from a bundle via its index')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('bundle', help=f"Bundle file (*{BUNDLE_SUFFIX})")
+        sub.add_argument('--name', action='append', help='Test name or fullName (repeatable)')
+        sub.add_argument('--status', action='append', help='Test status, e.g. failed (repeatable)')
+        sub.add_argument('--file', action='append', help='Result file name or path inside the run (repeatable)')
+        if name == 'extract':
+            sub.add_argument('--out', required=True, help='Output directory for result files')
+        sub.set_defaults(func=func)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Incremental sync of Allure *-result.json files from S3 to a local directory.
+
+Used by the allure-sync-results workflow instead of a full
+`aws s3 sync s3://qstp-results/Result/` over the whole history.
+
+A local manifest remembers every synced object:
+    key -> ETag / size / last-modified
+and, per test type, the newest date partition already seen. Results are
+stored as Result/<test-type>/YYYY-MM-DD/HH-MM-SS/<file>, so on the next run
+only date partitions from (newest seen - lookback days) onwards are listed.
+Only new or changed *-result.json objects are downloaded, with a bounded
+number of concurrent transfers. Entries of partitions older than that
+window are dropped from the manifest on save, so it stays bounded.
+
+If the manifest is missing (first run, expired cache) everything is listed
+again, but results already in the local tree are adopted into the manifest
+instead of being downloaded: loose files with the same size and MD5 ETag,
+and files packed by bundle_results.py whose run index
+(Result/<test-type>/<date>/<time>.index.json) records the same MD5 and size.
+
+Local S3 stand-ins (MinIO, moto server, localstack) work via --endpoint-url.
+
+Usage:
+    python3 sync_results.py \
+        --bucket qstp-results \
+        --dest /tmp/qubership-testing-results/Result \
+        --manifest /tmp/allure-sync/manifest.json
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+import boto3
+from botocore.config import Config
+
+from bundle_results import INDEX_SUFFIX
+
+MANIFEST_VERSION = 1
+RESULT_SUFFIX = '-result.json'
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+DATE_PREFIX = re.compile(r'^(\d{4}-\d{2}-\d{2})/$')
+DATE_PARTITION = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def load_manifest(path):
+    """Load the sync manifest; an absent or unreadable file means a full sync"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') == MANIFEST_VERSION:
+            return manifest
+        print(f"⚠️  Manifest version mismatch in {path}, starting from scratch")
+    except FileNotFoundError:
+        print(f"ℹ️  No manifest at {path}, running full listing")
+    except (OSError, ValueError) as e:
+        print(f"⚠️  Cannot read manifest {path}: {e}, running full listing")
+    return {'version': MANIFEST_VERSION, 'objects': {}, 'partitions': {}}
+
+
+def save_manifest(manifest, path):
+    """Write the manifest atomically so an interrupted run keeps the old one"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def partition_cutoff(manifest, test_type, lookback_days):
+    """Oldest date partition still re-listed for a test type, or None before its first sync"""
+    known = manifest['partitions'].get(test_type)
+    if not known:
+        return None
+    return (datetime.strptime(known, '%Y-%m-%d') - timedelta(days=lookback_days)).strftime('%Y-%m-%d')
+
+
+def prune_manifest(manifest, root, lookback_days):
+    """
+    Drop object entries of date partitions that are no longer listed.
+
+    Such partitions are skipped by select_partitions, so their entries are
+    never compared again. Returns the number of dropped entries.
+    """
+    stale = []
+    for key in manifest['objects']:
+        parts = key[len(root):].split('/')
+        if len(parts) < 3 or not DATE_PARTITION.match(parts[1]):
+            continue
+        cutoff = partition_cutoff(manifest, parts[0], lookback_days)
+        if cutoff and parts[1] < cutoff:
+            stale.append(key)
+    for key in stale:
+        del manifest['objects'][key]
+    return len(stale)
+
+
+def list_common_prefixes(client, bucket, prefix):
+    """List direct sub-prefixes (and loose objects) under prefix"""
+    prefixes = []
+    objects = []
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter='/'):
+        prefixes.extend(p['Prefix'] for p in page.get('CommonPrefixes', []))
+        objects.extend(page.get('Contents', []))
+    return prefixes, objects
+
+
+def list_result_objects(client, bucket, prefix):
+    """List every *-result.json object below prefix"""
+    objects = []
+    paginator = client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+        objects.extend(o for o in page.get('Contents', []) if o['Key'].endswith(RESULT_SUFFIX))
+    return objects
+
+
+def select_partitions(client, bucket, root, manifest, lookback_days):
+    """
+    Return the prefixes to list in full and the loose objects found on the way.
+
+    For each Result/<test-type>/ only date partitions not older than the newest
+    known one minus lookback_days are kept. Prefixes that are not dates are
+    always listed.
+    """
+    type_prefixes, loose = list_common_prefixes(client, bucket, root)
+    selected = []
+    newest = {}
+
+    for type_prefix in type_prefixes:
+        test_type = type_prefix[len(root):].rstrip('/')
+        date_prefixes, type_loose = list_common_prefixes(client, bucket, type_prefix)
+        loose.extend(type_loose)
+
+        cutoff = partition_cutoff(manifest, test_type, lookback_days)
+
+        for date_prefix in date_prefixes:
+            match = DATE_PREFIX.match(date_prefix[len(type_prefix):])
+            if not match:
+                selected.append(date_prefix)
+                continue
+            date = match.group(1)
+            if date > newest.get(test_type, ''):
+                newest[test_type] = date
+            if cutoff is None or date >= cutoff:
+                selected.append(date_prefix)
+
+        skipped = len(date_prefixes) - sum(1 for p in selected if p.startswith(type_prefix))
+        print(f"📁 {test_type}: {len(date_prefixes)} partitions, {skipped} skipped as already synced")
+
+    loose = [o for o in loose if o['Key'].endswith(RESULT_SUFFIX)]
+    return selected, loose, newest
+
+
+def local_md5(path):
+    """MD5 of a local file, comparable to a non-multipart S3 ETag"""
+    digest = hashlib.md5()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def manifest_entry(obj):
+    """Manifest record for a listed S3 object"""
+    return {
+        'etag': obj['ETag'].strip('"'),
+        'size': obj['Size'],
+        'last_modified': obj['LastModified'].isoformat(),
+    }
+
+
+def bundled_entry(relative_key, dest, run_indexes):
+    """
+    Index entry of a result file packed into its run bundle, if any.
+
+    relative_key is <test-type>/<date>/<time>/<path inside the run>; the index
+    sits next to the run directory as <dest>/<test-type>/<date>/<time>.index.json.
+    """
+    parts = relative_key.split('/')
+    if len(parts) < 4:
+        return None
+    index_path = os.path.join(dest, *parts[:3]) + INDEX_SUFFIX
+    file_name = '/'.join(parts[3:])
+    if index_path not in run_indexes:
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                run_indexes[index_path] = {e['file']: e for e in json.load(f).get('tests', [])}
+        except (OSError, ValueError):
+            run_indexes[index_path] = {}
+    return run_indexes[index_path].get(file_name)
+
+
+def needs_download(obj, manifest, root, dest, run_indexes):
+    """Decide whether an object is new or changed since the last sync"""
+    relative_key = obj['Key'][len(root):]
+    local_path = os.path.join(dest, *relative_key.split('/'))
+    entry = manifest_entry(obj)
+    known = manifest['objects'].get(obj['Key'])
+    if known:
+        return known['etag'] != entry['etag'] or known['size'] != entry['size']
+
+    # Not in the manifest: adopt a copy already packed into the run bundle
+    bundled = bundled_entry(relative_key, dest, run_indexes)
+    if bundled and bundled.get('size') == entry['size']:
+        # Multipart ETags are not an MD5; size must do for those
+        if '-' in entry['etag'] or bundled.get('md5') == entry['etag']:
+            manifest['objects'][obj['Key']] = entry
+            return False
+
+    # ... or an identical loose local copy (e.g. from the git clone)
+    try:
+        if os.path.getsize(local_path) == entry['size'] and '-' not in entry['etag']:
+            if local_md5(local_path) == entry['etag']:
+                manifest['objects'][obj['Key']] = entry
+                return False
+    except OSError:
+        pass
+    return True
+
+
+def download(client, bucket, obj, local_path):
+    """
+    Download one object via a temporary file so partial files never appear.
+
+    Result files are small, so a plain GetObject stream is cheaper than
+    download_file, which sets up a transfer manager per call.
+    """
+    os.makedirs(os.path.dirname(local_path), exist_ok=True)
+    tmp_path = f"{local_path}.part"
+    response = client.get_object(Bucket=bucket, Key=obj['Key'])
+    with open(tmp_path, 'wb') as f:
+        for chunk in response['Body'].iter_chunks(DOWNLOAD_CHUNK_BYTES):
+            f.write(chunk)
+    os.replace(tmp_path, local_path)
+    return obj
+
+
+def sync(client, bucket, root, dest, manifest, concurrency=16, lookback_days=1):
+    """Sync new or changed result objects; returns the list of downloaded keys"""
+    selected, loose, newest = select_partitions(client, bucket, root, manifest, lookback_days)
+    print(f"🔎 Listing {len(selected)} partitions")
+
+    candidates = list(loose)
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for objects in executor.map(lambda p: list_result_objects(client, bucket, p), selected):
+            candidates.extend(objects)
+
+    pending = []
+    run_indexes = {}
+    for obj in candidates:
+        local_path = os.path.join(dest, *obj['Key'][len(root):].split('/'))
+        if needs_download(obj, manifest, root, dest, run_indexes):
+            pending.append((obj, local_path))
+
+    print(f"⬇️  {len(candidates)} result objects listed, {len(pending)} new or changed")
+
+    downloaded = []
+    failed = 0
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = [executor.submit(download, client, bucket, obj, path) for obj, path in pending]
+        for future in futures:
+            try:
+                obj = future.result()
+            except Exception as e:
+                failed += 1
+                print(f"❌ Download failed: {e}", file=sys.stderr)
+                continue
+            manifest['objects'][obj['Key']] = manifest_entry(obj)
+            downloaded.append(obj['Key'])
+
+    # Only advance partitions when everything arrived, so failures are retried
+    if not failed:
+        for test_type, date in newest.items():
+            if date > manifest['partitions'].get(test_type, ''):
+                manifest['partitions'][test_type] = date
+
+    return downloaded, failed
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description='Incremental S3 to local sync of Allure results')
+    parser.add_argument('--bucket', default='qstp-results', help='Source S3 bucket')
+    parser.add_argument('--prefix', default='Result/', help='Root prefix in the bucket')
+    parser.add_argument('--dest', required=True, help='Local directory mirroring the prefix')
+    parser.add_argument('--manifest', required=True, help='Path of the sync manifest (JSON)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Parallel list/download requests')
+    parser.add_argument('--lookback-days', type=int, default=1,
+                        help='Re-list this many days before the newest synced partition')
+    parser.add_argument('--endpoint-url', default=None, help='Custom S3 endpoint (local S3 stand-in)')
+    parser.add_argument('--changed-list', help='Write downloaded local paths to this file')
+    args = parser.parse_args()
+
+    root = args.prefix if args.prefix.endswith('/') else args.prefix + '/'
+    concurrency = max(args.concurrency, 1)
+    # One pooled connection per worker, so listing and download threads never wait for a slot
+    client = boto3.client('s3', endpoint_url=args.endpoint_url,
+                          config=Config(max_pool_connections=concurrency))
+    manifest = load_manifest(args.manifest)
+    lookback_days = max(args.lookback_days, 0)
+
+    print(f"✅ Syncing s3://{args.bucket}/{root} -> {args.dest}")
+    try:
+        downloaded, failed = sync(client, args.bucket, root, args.dest, manifest,
+                                  concurrency, lookback_days)
+    finally:
+        pruned = prune_manifest(manifest, root, lookback_days)
+        if pruned:
+            print(f"🧹 Dropped {pruned} manifest entries of partitions no longer listed")
+        save_manifest(manifest, args.manifest)
+
+    if args.changed_list:
+        with open(args.changed_list, 'w', encoding='utf-8') as f:
+            for key in downloaded:
+                f.write(os.path.join(args.dest, *key[len(root):].split('/')) + '\n')
+
+    print(f"✅ Downloaded {len(downloaded)} files, {len(manifest['objects'])} tracked in manifest")
+    if failed:
+        print(f"❌ {failed} downloads failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()